@@ -0,0 +1,24 @@
+"""
+Settings overrides for running the test suite.
+
+Swaps Postgres for an in-memory SQLite database so the tests skip
+database server setup and per-transaction disk syncs, and writes
+uploaded media to a throwaway temp directory.
+"""
+import tempfile
+
+from app.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="recipe-app-test-media-")
+
+# Nearly every test creates a user; the default PBKDF2 hasher spends
+# tens of ms per create_user call, which hashing strength doesn't buy
+# anything in tests.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
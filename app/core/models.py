@@ -85,6 +85,11 @@ class Tag(models.Model):
     )
     name = models.CharField(max_length=255)
 
+    class Meta:
+        # The list endpoints filter by user and order by -name; a
+        # composite index serves that as a single range scan.
+        indexes = [models.Index(fields=["user", "-name"])]
+
     def __str__(self):
         """Return string representation of the Tag."""
         return self.name
@@ -99,6 +104,9 @@ class Ingredient(models.Model):
     )
     name = models.CharField(max_length=255)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "-name"])]
+
     def __str__(self):
         """Return string representation of the Ingredient."""
         return self.name
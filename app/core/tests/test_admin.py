@@ -7,18 +7,20 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import Client
 
+User = get_user_model()
+
 
 class AdminSiteTests(TestCase):
     """Test for django admin"""
 
     def setUp(self):
         self.client = Client()
-        self.admin_user = get_user_model().objects.create_superuser(
+        self.admin_user = User.objects.create_superuser(
             email='admin@example.com',
             password='test123'
         )
         self.client.force_login(self.admin_user)
-        self.user = get_user_model().objects.create_user(
+        self.user = User.objects.create_user(
             email='user@example.com',
             password='test123',
             name='Test user'
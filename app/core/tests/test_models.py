@@ -9,10 +9,12 @@ from django.contrib.auth import get_user_model
 
 from core import models
 
+User = get_user_model()
+
 
 def create_user(email="eee@example.com", password="test123"):
     """Create and return a sample user"""
-    return get_user_model().objects.create_user(email, password)
+    return User.objects.create_user(email, password)
 
 
 class ModelTests(TestCase):
@@ -23,7 +25,7 @@ class ModelTests(TestCase):
         """
         email = 'test@example.com'
         password = 'testpass123'
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             email=email,
             password=password
         )
@@ -43,18 +45,18 @@ class ModelTests(TestCase):
         ]
 
         for email, expected in sample_emails:
-            user = get_user_model().objects.create_user(email, 'test123')
+            user = User.objects.create_user(email, 'test123')
             self.assertEqual(user.email, expected)
 
     def test_new_user_without_email_raises_error(self):
         with self.assertRaises(ValueError):
-            get_user_model().objects.create_user('', 'test123')
+            User.objects.create_user('', 'test123')
 
     def test_create_new_superuser(self):
         """
         Test creating a new superuser
         """
-        user = get_user_model().objects.create_superuser(
+        user = User.objects.create_superuser(
             'test@example.com',
             'test123'
         )
@@ -66,7 +68,7 @@ class ModelTests(TestCase):
         """
         Test creating a recipe
         """
-        user = get_user_model().objects.create_user(
+        user = User.objects.create_user(
             'test@example.com'
             'test123'
         )
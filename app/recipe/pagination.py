@@ -0,0 +1,75 @@
+"""
+Pagination classes for the recipe app
+"""
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Page-number pagination that caches the total COUNT(*) per user
+
+    The count query scales with table size and runs on every paginated
+    list request; caching it for a short TTL (and bumping a per-user
+    version on writes) keeps pages past the first from re-counting.
+    """
+
+    count_timeout = 300
+    # No global page size is configured, so pagination is opt-in per
+    # request via ?page_size=N; responses without it stay plain lists.
+    page_size_query_param = "page_size"
+
+    @staticmethod
+    def _version_key(user_id):
+        return f"page-count-version:{user_id}"
+
+    @classmethod
+    def invalidate_count(cls, user):
+        """Drop cached counts for the given user after a write"""
+        try:
+            cache.incr(cls._version_key(user.id))
+        except ValueError:
+            pass  # nothing cached for this user yet
+
+    def _count_cache_key(self, request, view):
+        params = request.query_params.copy()
+        params.pop(self.page_query_param, None)
+        version = cache.get_or_set(self._version_key(request.user.id), 0)
+        return "page-count:{}:{}:{}:{}".format(
+            view.__class__.__name__,
+            request.user.id,
+            params.urlencode(),
+            version,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate like PageNumberPagination, reusing a cached count"""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        cache_key = self._count_cache_key(request, view)
+        count = cache.get(cache_key)
+        if count is None:
+            cache.set(cache_key, paginator.count, self.count_timeout)
+        else:
+            paginator.count = count  # pre-seed to skip the COUNT(*)
+
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        self.request = request
+        return list(self.page)
@@ -2,6 +2,8 @@
 Serializers for Recipe app
 """
 
+from django.db import models, transaction
+
 from rest_framework import serializers
 
 from core.models import Recipe, Tag, Ingredient
@@ -42,8 +44,10 @@ class RecipeImageSerializer(serializers.ModelSerializer):
 class RecipeSerializer(serializers.ModelSerializer):
     """Serializer for Recipe objects"""
 
-    tags = TagSerializer(many=True, required=False)
-    ingredients = IngredientSerializer(many=True, required=False)
+    # Plain dicts on the read path; nested serializer binding and
+    # to_representation recursion are a hot spot on list responses.
+    tags = serializers.SerializerMethodField()
+    ingredients = serializers.SerializerMethodField()
 
     class Meta:
         model = Recipe
@@ -53,25 +57,98 @@ class RecipeSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id"]
 
+    def get_tags(self, obj):
+        """Return the recipe's tags as plain dicts"""
+        return [{"id": tag.id, "name": tag.name} for tag in obj.tags.all()]
+
+    def get_ingredients(self, obj):
+        """Return the recipe's ingredients as plain dicts"""
+        return [
+            {"id": ingredient.id, "name": ingredient.name}
+            for ingredient in obj.ingredients.all()
+        ]
+
+    def to_internal_value(self, data):
+        """Validate the writable nested tags/ingredients payloads"""
+        ret = super().to_internal_value(data)
+        if "tags" in data:
+            nested = TagSerializer(many=True, data=data["tags"])
+            if not nested.is_valid():
+                # Re-key the list-shaped errors under the field so the
+                # response body matches the nested-field baseline.
+                raise serializers.ValidationError({"tags": nested.errors})
+            ret["tags"] = nested.validated_data
+        if "ingredients" in data:
+            nested = IngredientSerializer(many=True, data=data["ingredients"])
+            if not nested.is_valid():
+                raise serializers.ValidationError(
+                    {"ingredients": nested.errors}
+                )
+            ret["ingredients"] = nested.validated_data
+        return ret
+
+    def _bulk_get_or_create(self, model, items_data):
+        """Get or create objects for the given model in bulk"""
+        auth_user = self.context["request"].user
+        # The cache lives in the serializer context, so repeated names
+        # within one request never hit the database twice.
+        cache = self.context.setdefault("_attr_cache", {})
+        # dict.fromkeys dedupes while keeping payload order; without a
+        # unique constraint on (user, name), repeated names would
+        # otherwise bulk-insert duplicate rows.
+        names = list(dict.fromkeys(
+            item_data["name"] for item_data in items_data
+        ))
+
+        lookup = [name for name in names if (model, name) not in cache]
+        if lookup:
+            found = {
+                obj.name: obj
+                for obj in model.objects.filter(
+                    user=auth_user, name__in=lookup
+                )
+            }
+            missing = [
+                model(user=auth_user, name=name)
+                for name in lookup if name not in found
+            ]
+            if missing:
+                model.objects.bulk_create(missing, ignore_conflicts=True)
+                found = {
+                    obj.name: obj
+                    for obj in model.objects.filter(
+                        user=auth_user, name__in=lookup
+                    )
+                }
+            for name, obj in found.items():
+                cache[(model, name)] = obj
+
+        return [
+            cache[(model, name)] for name in names if (model, name) in cache
+        ]
+
     def _get_or_create_tags(self, instance, tags_data):
         """Get or create tags"""
-        auth_user = self.context["request"].user
-        for tag_data in tags_data:
-            tag, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag_data
-            )
-            instance.tags.add(tag)
+        tags = self._bulk_get_or_create(Tag, tags_data)
+        instance.tags.add(*tags)
 
     def _get_or_create_ingredients(self, instance, ingredients_data):
         """Get or create ingredients"""
-        auth_user = self.context["request"].user
-        for ingredient_data in ingredients_data:
-            ingredient, created = Ingredient.objects.get_or_create(
-                user=auth_user, **ingredient_data
-            )
-            instance.ingredients.add(ingredient)
+        ingredients = self._bulk_get_or_create(Ingredient, ingredients_data)
+        instance.ingredients.add(*ingredients)
+
+    def _sync_related(self, manager, model, items_data):
+        """Sync an M2M relation to the given payload, touching only diffs"""
+        desired = {
+            obj.id for obj in self._bulk_get_or_create(model, items_data)
+        }
+        current = set(manager.values_list("id", flat=True))
+        if desired - current:
+            manager.add(*(desired - current))
+        if current - desired:
+            manager.remove(*(current - desired))
 
+    @transaction.atomic
     def create(self, validated_data):
         """Create a new Recipe"""
         tags_data = validated_data.pop("tags", [])
@@ -82,23 +159,39 @@ class RecipeSerializer(serializers.ModelSerializer):
 
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Update a Recipe"""
         tags_data = validated_data.pop("tags", None)
         ingredients_data = validated_data.pop("ingredients", None)
 
         if tags_data is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(instance, tags_data)
+            self._sync_related(instance.tags, Tag, tags_data)
 
         if ingredients_data is not None:
-            instance.ingredients.clear()
-            self._get_or_create_ingredients(instance, ingredients_data)
+            self._sync_related(
+                instance.ingredients, Ingredient, ingredients_data
+            )
+
+        # File fields must go through save(): QuerySet.update() skips
+        # FileField.pre_save, so the upload would never reach storage
+        # and upload_to would never be applied.
+        file_data = {
+            name: validated_data.pop(name)
+            for name in list(validated_data)
+            if isinstance(Recipe._meta.get_field(name), models.FileField)
+        }
+        if file_data:
+            for name, value in file_data.items():
+                setattr(instance, name, value)
+            instance.save(update_fields=list(file_data))
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
+        if validated_data:
+            # Write only the submitted columns instead of saving the
+            # whole row back, then repopulate for the response.
+            Recipe.objects.filter(pk=instance.pk).update(**validated_data)
+            instance.refresh_from_db()
 
-        instance.save()
         return instance
 
 
@@ -13,18 +13,25 @@ from core.models import Ingredient
 
 from recipe.serializers import IngredientSerializer
 
+User = get_user_model()
+
 
 INGREDIENTS_URL = reverse("recipe:ingredient-list")
 
+# Resolve the detail pattern once instead of calling reverse() per test.
+INGREDIENT_DETAIL_URL = reverse(
+    "recipe:ingredient-detail", args=[0]
+).replace("0", "{id}")
+
 
 def detail_url(ingredient_id):
     """Return ingredient detail URL"""
-    return reverse("recipe:ingredient-detail", args=[ingredient_id])
+    return INGREDIENT_DETAIL_URL.format(id=ingredient_id)
 
 
 def create_user(email="example@email.com", password="test"):
     """Create and return a sample user"""
-    return get_user_model().objects.create_user(email, password)
+    return User.objects.create_user(email, password)
 
 
 class PublicIngredientsApiTests(TestCase):
@@ -43,9 +50,12 @@ class PublicIngredientsApiTests(TestCase):
 class PrivateIngredientsApiTests(TestCase):
     """Test the private ingredients API"""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients_list(self):
@@ -0,0 +1,137 @@
+"""
+Tests for the cached-count pagination
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Recipe, Tag
+
+User = get_user_model()
+
+TAGS_URL = reverse("recipe:tag-list")
+RECIPES_URL = reverse("recipe:recipe-list")
+
+
+def tag_detail_url(tag_id):
+    """Return tag detail URL"""
+    return reverse("recipe:tag-detail", args=[tag_id])
+
+
+class CachedCountPaginationTests(TestCase):
+    """Test the opt-in cached count pagination"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            "pagination@example.com",
+            "testpass"
+        )
+
+    def setUp(self):
+        # The locmem cache outlives individual tests in-process, so
+        # clear it to keep cached counts from leaking between tests.
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name="Vegan"),
+            Tag(user=self.user, name="Dessert"),
+            Tag(user=self.user, name="Breakfast"),
+        ])
+
+    def test_list_unpaginated_by_default(self):
+        """Test the list stays a plain array without a page_size param"""
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(res.data, list)
+        self.assertEqual(len(res.data), 3)
+
+    def test_page_size_param_enables_pagination(self):
+        """Test passing page_size returns a paginated envelope"""
+        res = self.client.get(TAGS_URL, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual(len(res.data["results"]), 2)
+
+        res = self.client.get(TAGS_URL, {"page_size": 2, "page": "last"})
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_invalid_page_returns_not_found(self):
+        """Test requesting a page past the end returns a 404"""
+        res = self.client.get(TAGS_URL, {"page_size": 2, "page": 99})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_count_reused_from_cache(self):
+        """Test later requests serve the total count from the cache"""
+        self.client.get(TAGS_URL, {"page_size": 2})
+
+        # A write that bypasses the API doesn't bump the version key,
+        # so the count cached by the request above is still served.
+        Tag.objects.create(user=self.user, name="Lunch")
+        res = self.client.get(TAGS_URL, {"page_size": 2})
+
+        self.assertEqual(res.data["count"], 3)
+
+    def test_api_write_invalidates_count(self):
+        """Test writes through the API refresh the cached count"""
+        self.client.get(TAGS_URL, {"page_size": 2})
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name="Lunch"),
+            Tag(user=self.user, name="Dinner"),
+        ])
+
+        tag = Tag.objects.get(user=self.user, name="Dinner")
+        res = self.client.delete(tag_detail_url(tag.id))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+        res = self.client.get(TAGS_URL, {"page_size": 2})
+        self.assertEqual(res.data["count"], 4)
+
+    def test_recipe_update_invalidates_count(self):
+        """Test a recipe update creating tags refreshes the tag count"""
+        recipe = Recipe.objects.create(
+            user=self.user,
+            title="Sample recipe",
+            time_minutes=10,
+            price=Decimal("5.00"),
+        )
+        self.client.get(TAGS_URL, {"page_size": 2})
+
+        res = self.client.patch(
+            reverse("recipe:recipe-detail", args=[recipe.id]),
+            {"tags": [{"name": "Fusion"}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(TAGS_URL, {"page_size": 2})
+        self.assertEqual(res.data["count"], 4)
+
+    def test_recipe_list_pagination(self):
+        """Test the recipe list values() path honours pagination"""
+        Recipe.objects.bulk_create([
+            Recipe(
+                user=self.user,
+                title=f"Recipe {i}",
+                time_minutes=10,
+                price=Decimal("5.00"),
+            )
+            for i in range(3)
+        ])
+
+        res = self.client.get(RECIPES_URL, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 3)
+        self.assertEqual(len(res.data["results"]), 2)
@@ -2,35 +2,52 @@
 Tests for recipe API
 """
 
-import tempfile
+import io
 import os
 
 from PIL import Image
 
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.urls import reverse
 from decimal import Decimal
 
 from rest_framework import status  # HTTP status codes
-from rest_framework.test import APIClient  # test client
+from rest_framework.test import (  # test clients
+    APIClient,
+    APIRequestFactory,
+    force_authenticate,
+)
 
 from core.models import Recipe, Tag, Ingredient
 
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe.views import RecipeViewSet
+
+User = get_user_model()
 
 
 RECIPES_URL = reverse("recipe:recipe-list")
 
+# Resolve the detail/upload patterns once; reverse() walks the URL
+# resolver on every call, which adds up across the suite.
+RECIPE_DETAIL_URL = reverse(
+    "recipe:recipe-detail", args=[0]
+).replace("0", "{id}")
+RECIPE_UPLOAD_IMAGE_URL = reverse(
+    "recipe:recipe-upload-image", args=[0]
+).replace("0", "{id}")
+
 
 def detail_url(recipe_id):
     """Return recipe detail URL"""
-    return reverse("recipe:recipe-detail", args=[recipe_id])
+    return RECIPE_DETAIL_URL.format(id=recipe_id)
 
 
 def image_upload_url(recipe_id):
     """Return URL for recipe image upload"""
-    return reverse("recipe:recipe-upload-image", args=[recipe_id])
+    return RECIPE_UPLOAD_IMAGE_URL.format(id=recipe_id)
 
 
 def create_recipe(user, **params):
@@ -47,9 +64,40 @@ def create_recipe(user, **params):
     return Recipe.objects.create(user=user, **defaults)
 
 
+def create_recipes(user, n=1, **params):
+    """Create and return n sample recipes with a single bulk insert"""
+    defaults = {
+        "title": "Sample recipe",
+        "time_minutes": 10,
+        "price": Decimal("5.25"),
+        "description": "Sample description",
+        "link": "https://sample.com/sample-recipe",
+    }
+    defaults.update(params)
+
+    return Recipe.objects.bulk_create(
+        [Recipe(user=user, **defaults) for _ in range(n)]
+    )
+
+
 def create_user(**params):
     """Create and return a sample user"""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
+
+
+# Factory requests skip the middleware stack; use them for tests that
+# only assert viewset output, keeping APIClient for integration tests.
+factory = APIRequestFactory()
+
+
+def _small_jpeg():
+    """Return the bytes of a 1x1 JPEG, encoded once at import"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (1, 1)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+SMALL_JPEG = _small_jpeg()
 
 
 class PublicRecipeApiTests(TestCase):
@@ -69,18 +117,21 @@ class PublicRecipeApiTests(TestCase):
 class PrivateRecipeApiTests(TestCase):
     """Test authenticated recipe API access"""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="email1@example.com", password="test123")
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user(email="email1@example.com", password="test123")
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self):
         """Test retrieving a list of recipes"""
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        create_recipes(user=self.user, n=2)
 
-        url = RECIPES_URL
-        response = self.client.get(url)
+        request = factory.get(RECIPES_URL)
+        force_authenticate(request, user=self.user)
+        response = RecipeViewSet.as_view({"get": "list"})(request)
 
         recipes = Recipe.objects.all().order_by("-id")
         serializer = RecipeSerializer(recipes, many=True)
@@ -108,8 +159,11 @@ class PrivateRecipeApiTests(TestCase):
         """Test viewing a recipe detail"""
         recipe = create_recipe(user=self.user)
 
-        url = detail_url(recipe.id)
-        response = self.client.get(url)
+        request = factory.get(detail_url(recipe.id))
+        force_authenticate(request, user=self.user)
+        response = RecipeViewSet.as_view({"get": "retrieve"})(
+            request, pk=recipe.id
+        )
 
         serializer = RecipeDetailSerializer(recipe)
 
@@ -232,9 +286,9 @@ class PrivateRecipeApiTests(TestCase):
         tags = recipe[0].tags.all()
 
         self.assertEqual(tags.count(), 2)
+        names = set(tags.values_list("name", flat=True))
         for tag in payload["tags"]:
-            exists = tags.filter(name=tag["name"]).exists()
-            self.assertTrue(exists)
+            self.assertIn(tag["name"], names)
 
     def test_create_recipe_with_existing_tags(self):
         tag_indian = Tag.objects.create(user=self.user, name="Indian")
@@ -257,9 +311,9 @@ class PrivateRecipeApiTests(TestCase):
         self.assertEqual(tags.count(), 2)
         self.assertIn(tag_indian, tags)
 
+        names = set(tags.values_list("name", flat=True))
         for tag in payload["tags"]:
-            exists = tags.filter(name=tag["name"], user=self.user).exists()
-            self.assertTrue(exists)
+            self.assertIn(tag["name"], names)
 
     def test_create_tage_on_update(self):
         recipe = create_recipe(user=self.user)
@@ -289,6 +343,49 @@ class PrivateRecipeApiTests(TestCase):
         self.assertIn(tag_lunch, recipe.tags.all())
         self.assertNotIn(tag_breakfast, recipe.tags.all())
 
+    def test_create_recipe_with_duplicate_tags(self):
+        """Test duplicate tag names in the payload create one tag"""
+        payload = {
+            "title": "Sample recipe",
+            "time_minutes": 10,
+            "price": Decimal("5.25"),
+            "tags": [{"name": "Lunch"}, {"name": "Lunch"}],
+        }
+
+        response = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Tag.objects.filter(user=self.user, name="Lunch").count(), 1
+        )
+
+    def test_create_recipe_with_invalid_tags_error(self):
+        """Test creating a recipe with invalid tags returns an error"""
+        payload = {
+            "title": "Sample recipe",
+            "time_minutes": 10,
+            "price": Decimal("5.25"),
+            "tags": [{"name": ""}],
+        }
+
+        response = self.client.post(RECIPES_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("tags", response.data)
+
+    def test_update_recipe_with_invalid_ingredients_error(self):
+        """Test updating a recipe with invalid ingredients returns an
+        error"""
+        recipe = create_recipe(user=self.user)
+
+        payload = {"ingredients": [{"name": ""}]}
+
+        url = detail_url(recipe.id)
+        res = self.client.patch(url, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ingredients", res.data)
+
     def test_clear_recipe_tags(self):
         tag = Tag.objects.create(user=self.user, name="Breakfast")
         recipe = create_recipe(user=self.user)
@@ -319,9 +416,9 @@ class PrivateRecipeApiTests(TestCase):
         ingredients = recipe[0].ingredients.all()
 
         self.assertEqual(ingredients.count(), 2)
+        names = set(ingredients.values_list("name", flat=True))
         for ingredient in payload["ingredients"]:
-            exists = ingredients.filter(name=ingredient["name"]).exists()
-            self.assertTrue(exists)
+            self.assertIn(ingredient["name"], names)
 
     def test_create_recipe_with_existing_ingredients(self):
         ingredient_rice = Ingredient.objects.create(
@@ -347,11 +444,9 @@ class PrivateRecipeApiTests(TestCase):
         self.assertEqual(ingredients.count(), 2)
         self.assertIn(ingredient_rice, ingredients)
 
+        names = set(ingredients.values_list("name", flat=True))
         for ingredient in payload["ingredients"]:
-            exists = ingredients.filter(
-                name=ingredient["name"], user=self.user
-            ).exists()
-            self.assertTrue(exists)
+            self.assertIn(ingredient["name"], names)
 
     def test_create_ingredient_on_update(self):
         recipe = create_recipe(user=self.user)
@@ -403,12 +498,15 @@ class PrivateRecipeApiTests(TestCase):
 
 
 class RecipeImageUploadTests(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email="userser@example.com",
             password="test123"
         )
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(self.user)
         self.recipe = create_recipe(user=self.user)
 
@@ -417,20 +515,38 @@ class RecipeImageUploadTests(TestCase):
 
     def test_upload_image_to_recipe(self):
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as temp_file:
-            image = Image.new("RGB", (10, 10))
-            image.save(temp_file, format="JPEG")
-            temp_file.seek(0)
-            response = self.client.post(
-                url, {"image": temp_file},
-                format="multipart"
-            )
+        image = SimpleUploadedFile(
+            "test.jpg", SMALL_JPEG, content_type="image/jpeg"
+        )
+        response = self.client.post(
+            url, {"image": image},
+            format="multipart"
+        )
 
         self.recipe.refresh_from_db()
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("image", response.data)
         self.assertTrue(os.path.exists(self.recipe.image.path))
 
+    def test_patch_recipe_image_via_detail(self):
+        """Test updating the image through the detail endpoint"""
+        url = detail_url(self.recipe.id)
+        image = SimpleUploadedFile(
+            "patched.jpg", SMALL_JPEG, content_type="image/jpeg"
+        )
+        response = self.client.patch(
+            url, {"image": image},
+            format="multipart"
+        )
+
+        self.recipe.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The file must land on storage at the upload_to path, not be
+        # stored under the client-supplied filename.
+        self.assertTrue(os.path.exists(self.recipe.image.path))
+        self.assertIn("uploads/recipe/", self.recipe.image.name)
+        self.assertNotIn("patched", self.recipe.image.name)
+
     def test_upload_image_bad_request(self):
         url = image_upload_url(self.recipe.id)
         response = self.client.post(
@@ -11,7 +11,7 @@ from rest_framework.test import APIClient
 
 from core.models import Tag
 
-from recipe.serializers import TagSerializer
+User = get_user_model()
 
 # URL for the tags list
 TAGS_URL = reverse("recipe:tag-list")
@@ -24,52 +24,59 @@ def detail_url(tag_id):
 
 def create_user(email="user@example.com", password="password"):
     """Helper function to create a user"""
-    return get_user_model().objects.create_user(email, password)
+    return User.objects.create_user(email, password)
 
 
 class PublicTagsApiTests(TestCase):
     """Test the publicly available tags API"""
 
-    def setUp(self):
-        self.client = APIClient()
+    # Unauthenticated tests carry no per-test client state, so one
+    # shared instance avoids rebuilding the client for every test.
+    api_client = APIClient()
 
     def test_login_required(self):
         """Test that login is required for retrieving tags"""
 
         # Attempt to retrieve tags without logging in
-        res = self.client.get(TAGS_URL)
+        res = self.api_client.get(TAGS_URL)
 
         # Assert that the request failed
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
 class PrivateTagsApiTests(TestCase):
+    api_client = APIClient()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
-        self.client.force_authenticate(self.user)
+        # Re-bind credentials on the shared client instead of building
+        # a fresh one per test.
+        self.api_client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test retrieving tags"""
 
-        # Create some tags
-        Tag.objects.create(user=self.user, name="Vegan")
-        Tag.objects.create(user=self.user, name="Dessert")
+        # Create some tags with a single INSERT
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name="Vegan"),
+            Tag(user=self.user, name="Dessert"),
+        ])
 
         # Retrieve tags
-        res = self.client.get(TAGS_URL)
-
-        # Get all tags for the user
-        tags = Tag.objects.all().order_by("-name")
+        res = self.api_client.get(TAGS_URL)
 
-        # Serialize the tags
-        serializer = TagSerializer(tags, many=True)
+        # Build the expected rows directly; re-serializing here would
+        # just repeat the work the view already did
+        expected = list(Tag.objects.values("id", "name").order_by("-name"))
 
         # Assert that the request was successful
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
         # Assert that the tags are the same
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(list(res.data), expected)
 
     def test_tags_limited_to_user(self):
         """Test that tags returned are for the authenticated user"""
@@ -77,12 +84,15 @@ class PrivateTagsApiTests(TestCase):
         # Create a new user
         user2 = create_user(email="use@emaple.com", password="password")
 
-        # Create some tags for the new user
-        Tag.objects.create(user=user2, name="Fruity")
-        tag = Tag.objects.create(user=self.user, name="Comfort Food")
+        # Create a tag for each user with a single INSERT
+        Tag.objects.bulk_create([
+            Tag(user=user2, name="Fruity"),
+            Tag(user=self.user, name="Comfort Food"),
+        ])
+        tag = Tag.objects.get(user=self.user)
 
         # Retrieve tags
-        res = self.client.get(TAGS_URL)
+        res = self.api_client.get(TAGS_URL)
 
         # Assert that the request was successful
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -96,7 +106,7 @@ class PrivateTagsApiTests(TestCase):
 
         payload = {"name": "New Tag Name"}
         url = detail_url(tag.id)
-        res = self.client.patch(url, payload)
+        res = self.api_client.patch(url, payload)
 
         tag.refresh_from_db()
 
@@ -107,8 +117,12 @@ class PrivateTagsApiTests(TestCase):
         tag = Tag.objects.create(user=self.user, name="Test Tag")
 
         url = detail_url(tag.id)
-        res = self.client.delete(url)
+        # Lock in the view's query count: one SELECT for get_object,
+        # the deletes for the tag row and its recipe links, and the
+        # savepoint pair from the atomic destroy hook.
+        with self.assertNumQueries(5):
+            res = self.api_client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
 
-        self.assertEqual(Tag.objects.count(), 0)
+        self.assertFalse(Tag.objects.filter(pk=tag.id).exists())
@@ -9,9 +9,15 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.decorators import method_decorator
 
 from core.models import Recipe, Tag, Ingredient
 from recipe import serializers
+from recipe.pagination import CachedCountPagination
 
 
 class RecipeViewSet(viewsets.ModelViewSet):
@@ -19,33 +25,125 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    # JSON only; the browsable renderer walks the serializer to build
+    # HTML forms even when the client asked for JSON.
+    renderer_classes = [JSONRenderer]
     queryset = Recipe.objects.all()
     serializer_class = serializers.RecipeDetailSerializer
+    serializer_action_classes = {
+        "list": serializers.RecipeSerializer,
+        "upload_image": serializers.RecipeImageSerializer,
+    }
+    pagination_class = CachedCountPagination
+
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        """Opt out of ATOMIC_REQUESTS so read-only requests skip the
+        BEGIN/COMMIT pair; writes open their own transactions below"""
+        return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
         """Return objects for the current authenticated user only"""
-        return self.queryset.filter(user=self.request.user).order_by("-id")
+        # DRF calls this several times per request (object lookup,
+        # listing, pagination); the viewset instance is request-scoped,
+        # so memoize the built queryset to skip redundant cloning.
+        if not hasattr(self, "_queryset_cache"):
+            queryset = (
+                self.queryset.filter(user=self.request.user)
+                .select_related("user")
+                .prefetch_related(
+                    Prefetch(
+                        "tags", queryset=Tag.objects.only("id", "name")
+                    ),
+                    Prefetch(
+                        "ingredients",
+                        queryset=Ingredient.objects.only("id", "name"),
+                    ),
+                )
+                .order_by("-id")
+            )
+            if self.action == "list":
+                # Whitelist the columns the list response renders;
+                # notably this leaves the description text behind.
+                # "user" stays in the list so the select_related join
+                # isn't deferred.
+                queryset = queryset.only(
+                    "id", "title", "time_minutes", "price", "link",
+                    "image", "user",
+                )
+            self._queryset_cache = queryset
+        return self._queryset_cache
 
     def get_serializer_class(self):
         """Return appropriate serializer class"""
-        if self.action == "list":
-            return serializers.RecipeSerializer
-        elif self.action == "upload_image":
-            return serializers.RecipeImageSerializer
+        return self.serializer_action_classes.get(
+            self.action, self.serializer_class
+        )
 
-        return self.serializer_class
+    def _related_map(self, model, recipe_ids):
+        """Map recipe id to its [{id, name}] rows for an M2M relation"""
+        related = {}
+        rows = model.objects.filter(recipe__in=recipe_ids).values(
+            "id", "name", "recipe"
+        )
+        for row in rows:
+            related.setdefault(row.pop("recipe"), []).append(row)
+        return related
+
+    def list(self, request, *args, **kwargs):
+        """List recipes from values() rows, skipping per-row model and
+        serializer instantiation"""
+        queryset = self.filter_queryset(self.get_queryset())
+        values_qs = queryset.prefetch_related(None).values(
+            "id", "title", "time_minutes", "price", "link", "image"
+        )
+        page = self.paginate_queryset(values_qs)
+        rows = page if page is not None else list(values_qs)
+
+        recipe_ids = [row["id"] for row in rows]
+        tag_map = self._related_map(Tag, recipe_ids)
+        ingredient_map = self._related_map(Ingredient, recipe_ids)
+
+        image_storage = Recipe._meta.get_field("image").storage
+        for row in rows:
+            row["price"] = str(row["price"])
+            row["image"] = (
+                request.build_absolute_uri(image_storage.url(row["image"]))
+                if row["image"] else None
+            )
+            row["tags"] = tag_map.get(row["id"], [])
+            row["ingredients"] = ingredient_map.get(row["id"], [])
 
-    def get_parser_classes(self):
-        """Return appropriate parser classes"""
-        if self.action == "upload_image":
-            return [FormParser, MultiPartParser]
-        return super().get_parser_classes()
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """Create a new recipe"""
         serializer.save(user=self.request.user)
-
-    @action(methods=["POST"], detail=True, url_path="upload-image")
+        CachedCountPagination.invalidate_count(self.request.user)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Update a recipe"""
+        serializer.save()
+        # Updates can create new tags/ingredients, changing the counts
+        # of those list endpoints.
+        CachedCountPagination.invalidate_count(self.request.user)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """Delete a recipe"""
+        instance.delete()
+        CachedCountPagination.invalidate_count(self.request.user)
+
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="upload-image",
+        parser_classes=[FormParser, MultiPartParser],
+    )
     def upload_image(self, request, pk=None):
         """Upload an image to a recipe"""
         recipe = self.get_object()
@@ -54,16 +152,12 @@ class RecipeViewSet(viewsets.ModelViewSet):
             data=request.data
         )
 
-        if serializer.is_valid():
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
             serializer.save()
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK
-            )
-
         return Response(
-            serializer.errors,
-            status=status.HTTP_400_BAD_REQUEST
+            serializer.data,
+            status=status.HTTP_200_OK
         )
 
 
@@ -75,14 +169,57 @@ class BaseRecipeAttrViewSet(
 ):
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer]
+    pagination_class = CachedCountPagination
+
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        """Opt out of ATOMIC_REQUESTS so read-only requests skip the
+        BEGIN/COMMIT pair; writes open their own transactions below"""
+        return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
         """Return objects for the current authenticated user only"""
-        return self.queryset.filter(user=self.request.user).order_by("-name")
+        # Memoized per request; see RecipeViewSet.get_queryset.
+        if not hasattr(self, "_queryset_cache"):
+            self._queryset_cache = (
+                self.queryset.filter(user_id=self.request.user.id)
+                .select_related("user")
+                .order_by("-name")
+            )
+        return self._queryset_cache
+
+    def list(self, request, *args, **kwargs):
+        """List objects, streaming rows when the response isn't
+        paginated so the queryset cache isn't populated as well"""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(
+            queryset.iterator(chunk_size=500), many=True
+        )
+        return Response(serializer.data)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """Create a new ingredient"""
         serializer.save(user=self.request.user)
+        CachedCountPagination.invalidate_count(self.request.user)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Update an object"""
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        """Delete an object"""
+        instance.delete()
+        CachedCountPagination.invalidate_count(self.request.user)
 
 
 class TagViewSet(BaseRecipeAttrViewSet):